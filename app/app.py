@@ -13,7 +13,13 @@ from viaa.observability import logging
 # External imports
 import inotify.adapters
 
-from app.helpers import get_iiif_file_destination, check_pronom_id, get_profile
+from app.catalog import OutputCatalog
+from app.helpers import (
+    get_iiif_file_destination,
+    get_file_hash,
+    check_pronom_id,
+    get_profile,
+)
 
 
 APP_NAME = "iiif-image-processor"
@@ -26,6 +32,7 @@ class Watcher:
         config_parser = ConfigParser()
         self.log = logging.get_logger(__name__, config=config_parser)
         self.config = config_parser.app_cfg
+        self.catalog = OutputCatalog(self.config["catalog"]["path"])
 
     def unzip_incoming_zip_to_workfolder(self) -> tuple[str, str]:
         # Unzips incoming zips from `FOLDER_TO_WATCH` in `WORKFOLDER`
@@ -33,6 +40,23 @@ class Watcher:
         return ("", "")
         pass
 
+    def check_catalog(self, fragment_id, cp_id, visibility, source_hash) -> None:
+        # Warn when an output is about to be overwritten by a different source,
+        # or when the fragment id is already published for another cp_id or visibility
+        for record in self.catalog.find(fragment_id):
+            if (record["cp_id"], record["visibility"]) != (cp_id, visibility):
+                self.log.warning(
+                    "Fragment id %s is already published at %s",
+                    fragment_id,
+                    record["destination"],
+                )
+            elif record["source_hash"] != source_hash:
+                self.log.warning(
+                    "Overwriting %s, published on %s from a different source",
+                    record["destination"],
+                    record["published_at"],
+                )
+
     def main(self) -> None:
         i = inotify.adapters.InotifyTree(FOLDER_TO_WATCH)
         self.log.info(f"Watching directory: '{FOLDER_TO_WATCH}'")
@@ -92,6 +116,10 @@ class Watcher:
 
             profile = get_profile(full_file_path)
 
+            fragment_id = Path(destination).stem
+            source_hash = get_file_hash(file_to_transform_path)
+            self.check_catalog(fragment_id, cp_id, visibility, source_hash)
+
             # my_env = environ.copy()
             # my_env["PATH"] = f"/opt/iiif-image-processing/env/bin:{my_env['PATH']}"
 
@@ -99,15 +127,23 @@ class Watcher:
             self.log.debug("Destination %s", destination)
 
             # Transform image by executing scripts
-            subprocess.run(
-                "python3 /opt/iiif-image-processing/transform_file.py"
-                + f" --file_path {file_to_transform_path}"
-                + f" --destination {destination}"
-                + f" --profile {profile}",
-                shell=True,
-                check=True,
-                # env=my_env,
-            )
+            try:
+                subprocess.run(
+                    "python3 /opt/iiif-image-processing/transform_file.py"
+                    + f" --file_path {file_to_transform_path}"
+                    + f" --destination {destination}"
+                    + f" --profile {profile}"
+                    + f" --cp_id {cp_id}"
+                    + f" --visibility {visibility}"
+                    + f" --source_hash {source_hash}",
+                    shell=True,
+                    check=True,
+                    # env=my_env,
+                )
+            except subprocess.CalledProcessError as e:
+                # Keep the zip and workfolder, nothing was published
+                self.log.error("Transforming %s failed: %s", file_to_transform_path, e)
+                continue
 
             # Remove temporary files and folders
             self.log.debug("Removing zip file %s", full_file_path)
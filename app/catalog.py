@@ -0,0 +1,205 @@
+# System imports
+import sqlite3
+from datetime import datetime, timezone
+
+
+class OutputCatalog:
+    """Local index of the published IIIF image files.
+
+    Every published output is recorded with the profile and source it was
+    created from, so lookups and audits don't need to walk the export folder.
+    Outputs are keyed on (fragment_id, cp_id, visibility), which matches the
+    structure of the destination path.
+    """
+
+    COLUMNS = (
+        "fragment_id",
+        "cp_id",
+        "visibility",
+        "destination",
+        "profile",
+        "width",
+        "height",
+        "size",
+        "source_hash",
+        "published_at",
+    )
+
+    def __init__(self, database_path):
+        # sqlite3 silently opens a temporary database for an empty path
+        if not database_path:
+            raise ValueError("No catalog path configured, set CATALOG_PATH")
+        self.connection = sqlite3.connect(database_path)
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS outputs (
+                    fragment_id TEXT NOT NULL,
+                    cp_id TEXT NOT NULL,
+                    visibility TEXT NOT NULL,
+                    destination TEXT NOT NULL,
+                    profile TEXT,
+                    width INTEGER,
+                    height INTEGER,
+                    size INTEGER,
+                    source_hash TEXT,
+                    published_at TEXT NOT NULL,
+                    PRIMARY KEY (fragment_id, cp_id, visibility)
+                )
+                """
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS outputs_source_hash "
+                "ON outputs (source_hash)"
+            )
+
+    def close(self):
+        self.connection.close()
+
+    def record(
+        self,
+        fragment_id,
+        cp_id,
+        visibility,
+        destination,
+        profile=None,
+        width=None,
+        height=None,
+        size=None,
+        source_hash=None,
+        publish=None,
+    ) -> dict | None:
+        """Record a published output, replacing a previous record for the same key.
+
+        The lookup of the previous record and the write happen in a single
+        transaction. If `publish` is given, it is called inside that transaction
+        after the write, so the record is only committed if publishing succeeds.
+
+        Params:
+            fragment_id: fragment id of the IIIF image file
+            cp_id: OR-ID of the content partner
+            visibility: public or restricted
+            destination: path the output was published to
+            profile: kakadu profile used to encode the output
+            width, height: dimensions of the encoded output
+            size: size of the output in bytes
+            source_hash: sha256 hash of the source essence file
+            publish: callable that publishes the output to the destination
+
+        Returns:
+            The replaced record, or None if the output was not published before.
+        """
+        published_at = datetime.now(timezone.utc).isoformat()
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            previous = self.get(fragment_id, cp_id, visibility)
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO outputs ({', '.join(self.COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in self.COLUMNS)})",
+                (
+                    fragment_id,
+                    cp_id,
+                    visibility,
+                    destination,
+                    profile,
+                    width,
+                    height,
+                    size,
+                    source_hash,
+                    published_at,
+                ),
+            )
+            if publish is not None:
+                publish()
+        return previous
+
+    def get(self, fragment_id, cp_id, visibility) -> dict | None:
+        """Get the record of a published output.
+
+        Returns:
+            record: dict, or None if the output is not in the catalog.
+        """
+        row = self.connection.execute(
+            "SELECT * FROM outputs "
+            "WHERE fragment_id = ? AND cp_id = ? AND visibility = ?",
+            (fragment_id, cp_id, visibility),
+        ).fetchone()
+        return dict(row) if row is not None else None
+
+    def find(self, fragment_id) -> list[dict]:
+        """Get all records of a fragment id, regardless of cp_id and visibility.
+
+        Returns:
+            records: list of dicts
+        """
+        rows = self.connection.execute(
+            "SELECT * FROM outputs WHERE fragment_id = ? ORDER BY cp_id, visibility",
+            (fragment_id,),
+        )
+        return [dict(row) for row in rows]
+
+    def list_outputs(self, cp_id=None, visibility=None, profile=None) -> list[dict]:
+        """List published outputs, optionally filtered.
+
+        Params:
+            cp_id: only list outputs of this content partner
+            visibility: only list public or restricted outputs
+            profile: only list outputs encoded with this profile
+
+        Returns:
+            records: list of dicts
+        """
+        filters = {"cp_id": cp_id, "visibility": visibility, "profile": profile}
+        clauses = [f"{column} = ?" for column, value in filters.items() if value]
+        params = [value for value in filters.values() if value]
+
+        query = "SELECT * FROM outputs"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY cp_id, visibility, fragment_id"
+
+        return [dict(row) for row in self.connection.execute(query, params)]
+
+    def find_colliding_fragment_ids(self) -> dict[str, list[dict]]:
+        """Find fragment ids that were published more than once, under a
+        different cp_id or visibility.
+
+        Returns:
+            collisions: dict of fragment id to the list of its records
+        """
+        rows = self.connection.execute(
+            """
+            SELECT * FROM outputs WHERE fragment_id IN (
+                SELECT fragment_id FROM outputs
+                GROUP BY fragment_id HAVING COUNT(*) > 1
+            )
+            ORDER BY fragment_id, cp_id, visibility
+            """
+        )
+        collisions = {}
+        for row in rows:
+            collisions.setdefault(row["fragment_id"], []).append(dict(row))
+        return collisions
+
+    def find_duplicate_sources(self) -> dict[str, list[dict]]:
+        """Find source files that were published under more than one fragment id.
+
+        Returns:
+            duplicates: dict of source hash to the list of its records
+        """
+        rows = self.connection.execute(
+            """
+            SELECT * FROM outputs WHERE source_hash IN (
+                SELECT source_hash FROM outputs
+                WHERE source_hash IS NOT NULL
+                GROUP BY source_hash HAVING COUNT(DISTINCT fragment_id) > 1
+            )
+            ORDER BY source_hash, fragment_id, cp_id, visibility
+            """
+        )
+        duplicates = {}
+        for row in rows:
+            duplicates.setdefault(row["source_hash"], []).append(dict(row))
+        return duplicates
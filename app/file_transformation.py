@@ -10,6 +10,7 @@ from wand.image import Image as WandImage
 
 # Internal imports
 from .kakadu import Kakadu
+from .profiles import get_kakadu_options
 from .helpers import get_file_name_without_extension, get_path_leaf
 
 config = ConfigParser()
@@ -80,16 +81,18 @@ class FileTransformer:
             lines = [line.strip() for line in lines]
         return lines
 
-    def encode_image(self, input_file_path, profile) -> str:
+    def encode_image(self, input_file_path, profile, dimensions=None) -> str:
         """Encode image to jp2 file using Kakadu.
 
         Params:
             input_file_path: path to file
+            profile: name of the kakadu profile
+            dimensions: (width, height) of the image, used to apply the size rules of the profile
 
         Returns:
             Path to encoded image
         """
-        kakadu_options = self.load_profile(profile)
+        kakadu_options = get_kakadu_options(self.load_profile(profile), dimensions)
 
         # Construct path to new image
         file_name = get_file_name_without_extension(input_file_path)
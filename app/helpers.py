@@ -1,6 +1,7 @@
 # System imports
 import os
 import ntpath
+import hashlib
 from retry import retry
 from shutil import copy2, move
 import xml.etree.ElementTree as ET
@@ -224,6 +225,59 @@ def move_file(source, destination):
         print(f"The source file {source} does not exist")
 
 
+def publish_file(source, destination):
+    """Move an output file to its destination and check it was published.
+    move_file does not raise when the source is missing, and an existing
+    destination may be an earlier output, so the source is checked first.
+
+    Params:
+        source: path to the output file
+        destination: path to publish the output file to
+
+    Raises:
+        FileNotFoundError: if the source was not moved to the destination
+    """
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"Could not publish {source}, it does not exist")
+    move_file(source, destination)
+    if os.path.exists(source) or not os.path.exists(destination):
+        raise FileNotFoundError(f"Could not publish {source} to {destination}")
+
+
+def get_fragment_id(sidecar_file_path) -> str:
+    """Get the fragment id from a sidecar file.
+    The sidecar is parsed incrementally and parsing stops at the first
+    FragmentId element, so the rest of the document is never read.
+
+    Params:
+        sidecar_file_path: absolute path to xml file containing metadata about the essence file
+
+    Returns:
+        fragment_id: string
+    """
+    with open(sidecar_file_path, "rb") as f:
+        for _, element in ET.iterparse(f, events=("end",)):
+            if element.tag == "FragmentId":
+                return element.text
+    raise ValueError(f"No FragmentId found in sidecar {sidecar_file_path}")
+
+
+def get_file_hash(file_path) -> str:
+    """Get the sha256 hash of a file, read in chunks.
+
+    Params:
+        file_path: path to file
+
+    Returns:
+        hexdigest: string
+    """
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
 def get_iiif_file_destination(essence_file_path, sidecar_file_path, visibility, cp_id):
     """Determine the destination location of a IIIF image file.
     The destination is constructed as following:
@@ -241,11 +295,8 @@ def get_iiif_file_destination(essence_file_path, sidecar_file_path, visibility,
         destination: path to destination
     """
 
-    tree = ET.parse(sidecar_file_path)
-    root = tree.getroot()
-
     image_base_folder = "/export/images/"
-    essence_file_name = root.find(".//FragmentId").text
+    essence_file_name = get_fragment_id(sidecar_file_path)
     characters = essence_file_name[:2]
 
     destination = (
@@ -0,0 +1,162 @@
+# System imports
+import math
+import operator
+import re
+
+RULE_PATTERN = re.compile(
+    r"^\[(longest_side|shortest_side|width|height)\s*(<=|>=|<|>)\s*(\d+)\]$"
+)
+# An option name is a `-flag` or a `Key=value`, anything else is a flag value,
+# e.g. `-,1,0.5` where `-` means no rate limit for the top layer.
+OPTION_PATTERN = re.compile(r"^-[A-Za-z]|=")
+OPERATORS = {
+    "<=": operator.le,
+    ">=": operator.ge,
+    "<": operator.lt,
+    ">": operator.gt,
+}
+
+# Size of the lowest resolution level when Clevels is set to `auto`.
+AUTO_LEVELS_TARGET = 256
+AUTO_LEVELS_MAX = 32
+
+
+def split_options(lines) -> list[list[str]]:
+    """Group kakadu options so an option and its value stay together.
+
+    `Key=value` lines are a single option, a `-flag` line takes the next line as
+    its value if that line is not an option itself (e.g. `-rate` and `3,0.25` or
+    `-rate` and `-,1,0.5`).
+
+    Params:
+        lines: kakadu options, one per line
+
+    Returns:
+        options: list of option groups
+    """
+    options = []
+    for line in lines:
+        if options and is_value(line) and is_flag_without_value(options[-1]):
+            options[-1].append(line)
+        else:
+            options.append([line])
+    return options
+
+
+def is_value(line) -> bool:
+    return not OPTION_PATTERN.search(line)
+
+
+def is_flag_without_value(option) -> bool:
+    return option[0].startswith("-") and len(option) == 1
+
+
+def get_option_key(option) -> str:
+    """Get the key of a kakadu option group, e.g. `Clevels` or `-rate`."""
+    return option[0].split("=", 1)[0]
+
+
+def parse_profile(lines) -> tuple[list[list[str]], list[tuple]]:
+    """Parse the lines of a profile into the base options and the size rules.
+
+    Lines starting with `#` and empty lines are ignored. A line such as
+    `[longest_side<=2500]` starts a rule: the options below it, up to the next
+    rule, override the base options for images matching the condition.
+
+    Params:
+        lines: stripped lines of a profile file
+
+    Returns:
+        (base_options, rules): the base option groups and a list of
+        (dimension, operator, value, option groups) tuples
+    """
+    base_lines = []
+    rules = []
+    current = base_lines
+    for line in lines:
+        if not line or line.startswith("#"):
+            continue
+        match = RULE_PATTERN.match(line)
+        if match:
+            dimension, op, value = match.groups()
+            current = []
+            rules.append((dimension, op, int(value), current))
+        elif line.startswith("["):
+            raise ValueError(f"Invalid profile rule '{line}'")
+        else:
+            current.append(line)
+
+    return (
+        split_options(base_lines),
+        [(dimension, op, value, split_options(rule_lines)) for dimension, op, value, rule_lines in rules],
+    )
+
+
+def get_auto_levels(width, height) -> int:
+    """Get the number of resolution levels for an image, so the lowest
+    resolution level fits in `AUTO_LEVELS_TARGET` pixels.
+
+    Params:
+        width: width of the image
+        height: height of the image
+
+    Returns:
+        levels: int
+    """
+    longest_side = max(width, height)
+    levels = math.ceil(math.log2(max(longest_side, 1) / AUTO_LEVELS_TARGET))
+    return min(max(levels, 1), AUTO_LEVELS_MAX)
+
+
+def get_kakadu_options(lines, dimensions=None) -> list[str]:
+    """Get the kakadu options of a profile for an image of the given size.
+
+    Every matching rule is applied in order, so a later rule overrides an
+    earlier one. The base options are kept as written, apart from the keys a
+    matching rule overrides. `Clevels=auto` is replaced by a level count derived
+    from the longest side. Without dimensions, only the base options are used.
+
+    Params:
+        lines: stripped lines of a profile file
+        dimensions: (width, height) of the image to encode
+
+    Returns:
+        kakadu_options: list of command line arguments
+    """
+    base_options, rules = parse_profile(lines)
+    overrides = {}
+
+    if dimensions is not None:
+        width, height = dimensions
+        sizes = {
+            "width": width,
+            "height": height,
+            "longest_side": max(width, height),
+            "shortest_side": min(width, height),
+        }
+        for dimension, op, value, rule_options in rules:
+            if OPERATORS[op](sizes[dimension], value):
+                for option in rule_options:
+                    overrides[get_option_key(option)] = option
+
+    # Base options are kept as written, an overridden key is replaced in place
+    options = []
+    replaced = set()
+    for option in base_options:
+        key = get_option_key(option)
+        if key not in overrides:
+            options.append(option)
+        elif key not in replaced:
+            options.append(overrides[key])
+            replaced.add(key)
+    options += [option for key, option in overrides.items() if key not in replaced]
+
+    kakadu_options = [line for option in options for line in option]
+
+    if "Clevels=auto" in kakadu_options:
+        if dimensions is None:
+            raise ValueError("Clevels=auto requires the dimensions of the image")
+        levels = get_auto_levels(*dimensions)
+        kakadu_options[kakadu_options.index("Clevels=auto")] = f"Clevels={levels}"
+
+    return kakadu_options
@@ -0,0 +1,90 @@
+# System imports
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+# External imports
+from PIL import Image
+
+# Internal imports
+from app.helpers import get_resize_params
+from app.kakadu import Kakadu
+from app.profiles import get_kakadu_options
+
+"""
+Benchmark the kakadu encoding of a profile per size class, comparing the fixed
+base options of the profile with the size-adaptive options. The size classes are
+source dimensions, which are resized with get_resize_params like in
+transform_file, so the benchmark encodes what the watcher encodes.
+
+Usage:
+    python -m benchmarks.encoding --profile image
+"""
+
+SIZE_CLASSES = {
+    "small": (1000, 750),
+    "medium": (3000, 2250),
+    "large": (12000, 9000),
+    "huge": (20000, 15000),
+    "portrait": (9000, 20000),
+}
+
+
+def create_test_image(file_path, dimensions):
+    """Create a noisy gradient tif, so the encoder has some detail to work with."""
+    gradient = Image.linear_gradient("L").resize(dimensions)
+    noise = Image.effect_noise(dimensions, 24)
+    image = Image.merge("RGB", (gradient, noise, Image.blend(gradient, noise, 0.5)))
+    image.save(file_path)
+
+
+def encode(kakadu, input_file_path, output_file_path, kakadu_options):
+    """Encode an image and return the encode time in seconds and output size in bytes."""
+    start = time.perf_counter()
+    kakadu.kdu_compress(input_file_path, output_file_path, kakadu_options)
+    duration = time.perf_counter() - start
+    return duration, Path(output_file_path).stat().st_size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--profile", type=str, default="default", help="Kakadu profile to be used", required=False
+    )
+    parser.add_argument(
+        "--size_classes",
+        type=str,
+        nargs="+",
+        default=list(SIZE_CLASSES),
+        choices=list(SIZE_CLASSES),
+        help="Size classes to benchmark",
+        required=False,
+    )
+    args = parser.parse_args()
+
+    with Path(f"profiles/{args.profile}.profile").open("r") as f:
+        lines = [line.strip() for line in f.readlines()]
+    fixed_options = get_kakadu_options(lines)
+
+    kakadu = Kakadu()
+
+    print(f"{'class':<8} {'encoded size':>12} {'settings':<9} {'time (s)':>9} {'output (bytes)':>15}")
+    with tempfile.TemporaryDirectory() as workfolder:
+        for size_class in args.size_classes:
+            dimensions = get_resize_params(*SIZE_CLASSES[size_class])
+            input_file_path = f"{workfolder}/{size_class}.tif"
+            create_test_image(input_file_path, dimensions)
+
+            settings = {
+                "fixed": fixed_options,
+                "adaptive": get_kakadu_options(lines, dimensions),
+            }
+            for name, kakadu_options in settings.items():
+                output_file_path = f"{workfolder}/{size_class}-{name}.jp2"
+                duration, size = encode(kakadu, input_file_path, output_file_path, kakadu_options)
+                print(
+                    f"{size_class:<8} {'x'.join(map(str, dimensions)):>12} {name:<9} "
+                    f"{duration:>9.2f} {size:>15}"
+                )
+                Path(output_file_path).unlink()
@@ -16,3 +16,14 @@ Qfactor=100
 -precise
 -flush_period
 1024
+
+# Small images: fewer resolution levels and quality layers
+[longest_side<=3000]
+Clevels=auto
+Clayers=6
+# Large images: extra resolution levels for zoomed-out tiles.
+# get_resize_params only caps the width (at 10000), so portrait images stay taller.
+# Clevels=auto gives 5 levels, like the base, for a longest side of 8000-8192 and
+# 6 above that, so this rule adds at most one level up to a longest side of 16384.
+[longest_side>=8000]
+Clevels=auto
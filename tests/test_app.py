@@ -1,4 +1,35 @@
+from unittest.mock import MagicMock
+
 import pytest
 
+from app import app
+from app.catalog import OutputCatalog
+
+
 def test_pass():
-    assert True
\ No newline at end of file
+    assert True
+
+
+@pytest.fixture
+def watcher(tmp_path):
+    watcher = app.Watcher.__new__(app.Watcher)
+    watcher.log = MagicMock()
+    watcher.catalog = OutputCatalog(tmp_path / "catalog.db")
+    watcher.catalog.record("ab12", "OR-1234567", "public", "/a.jp2", source_hash="hash1")
+    yield watcher
+    watcher.catalog.close()
+
+
+def test_check_catalog_same_source(watcher):
+    watcher.check_catalog("ab12", "OR-1234567", "public", "hash1")
+    watcher.log.warning.assert_not_called()
+
+
+def test_check_catalog_different_source(watcher):
+    watcher.check_catalog("ab12", "OR-1234567", "public", "hash2")
+    assert "different source" in watcher.log.warning.call_args.args[0]
+
+
+def test_check_catalog_published_elsewhere(watcher):
+    watcher.check_catalog("ab12", "OR-7654321", "restricted", "hash1")
+    assert "already published" in watcher.log.warning.call_args.args[0]
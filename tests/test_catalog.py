@@ -0,0 +1,67 @@
+import pytest
+
+from app.catalog import OutputCatalog
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = OutputCatalog(tmp_path / "catalog.db")
+    yield catalog
+    catalog.close()
+
+
+def test_record_and_get(catalog):
+    previous = catalog.record(
+        "ab12", "OR-1234567", "public", "/export/images/public/OR-1234567/ab/ab12.jp2",
+        profile="image", size=1024, source_hash="hash1",
+    )
+    assert previous is None
+
+    record = catalog.get("ab12", "OR-1234567", "public")
+    assert record["profile"] == "image"
+    assert record["size"] == 1024
+    assert catalog.get("ab12", "OR-1234567", "restricted") is None
+
+
+def test_record_returns_replaced_record(catalog):
+    catalog.record("ab12", "OR-1234567", "public", "/a.jp2", source_hash="hash1")
+    previous = catalog.record("ab12", "OR-1234567", "public", "/a.jp2", source_hash="hash2")
+
+    assert previous["source_hash"] == "hash1"
+    assert catalog.get("ab12", "OR-1234567", "public")["source_hash"] == "hash2"
+    assert len(catalog.list_outputs()) == 1
+
+
+def test_list_outputs_filters(catalog):
+    catalog.record("ab12", "OR-1234567", "public", "/a.jp2", profile="image")
+    catalog.record("cd34", "OR-1234567", "restricted", "/b.jp2", profile="default")
+    catalog.record("ef56", "OR-7654321", "public", "/c.jp2", profile="image")
+
+    assert len(catalog.list_outputs(cp_id="OR-1234567")) == 2
+    assert [r["fragment_id"] for r in catalog.list_outputs(profile="image")] == ["ab12", "ef56"]
+
+
+def test_find_collisions_and_duplicates(catalog):
+    catalog.record("ab12", "OR-1234567", "public", "/a.jp2", source_hash="hash1")
+    catalog.record("ab12", "OR-7654321", "public", "/b.jp2", source_hash="hash2")
+    catalog.record("cd34", "OR-7654321", "public", "/c.jp2", source_hash="hash2")
+
+    assert list(catalog.find_colliding_fragment_ids()) == ["ab12"]
+    assert len(catalog.find_colliding_fragment_ids()["ab12"]) == 2
+    assert list(catalog.find_duplicate_sources()) == ["hash2"]
+
+
+@pytest.mark.parametrize("database_path", ["", None])
+def test_empty_path_is_rejected(database_path):
+    with pytest.raises(ValueError):
+        OutputCatalog(database_path)
+
+
+def test_record_is_rolled_back_when_publishing_fails(catalog):
+    def publish():
+        raise FileNotFoundError("/a.jp2")
+
+    with pytest.raises(FileNotFoundError):
+        catalog.record("ab12", "OR-1234567", "public", "/a.jp2", publish=publish)
+
+    assert catalog.get("ab12", "OR-1234567", "public") is None
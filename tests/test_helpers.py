@@ -0,0 +1,48 @@
+import hashlib
+
+import pytest
+
+from app import helpers
+from app.catalog import OutputCatalog
+
+
+def test_get_fragment_id(tmp_path):
+    sidecar = tmp_path / "sidecar.xml"
+    sidecar.write_text(
+        "<Sidecar><Dynamic><FragmentId>ab12cd34</FragmentId>"
+        "<FragmentId>other</FragmentId></Dynamic></Sidecar>"
+    )
+    assert helpers.get_fragment_id(sidecar) == "ab12cd34"
+
+
+def test_get_fragment_id_missing(tmp_path):
+    sidecar = tmp_path / "sidecar.xml"
+    sidecar.write_text("<Sidecar><Dynamic><PID>ab12</PID></Dynamic></Sidecar>")
+    with pytest.raises(ValueError):
+        helpers.get_fragment_id(sidecar)
+
+
+def test_get_file_hash(tmp_path):
+    # Larger than a single chunk, so the hash is built from several reads
+    data = bytes(range(256)) * 5000
+    file_path = tmp_path / "essence.tif"
+    file_path.write_bytes(data)
+    assert helpers.get_file_hash(file_path) == hashlib.sha256(data).hexdigest()
+
+
+def test_publish_file_fails_on_existing_destination(tmp_path):
+    destination = tmp_path / "ab12.jp2"
+    destination.write_bytes(b"old output")
+    catalog = OutputCatalog(tmp_path / "catalog.db")
+    catalog.record("ab12", "OR-1234567", "public", str(destination), source_hash="hash1")
+
+    # The encoded file is missing, so the old output must not count as published
+    with pytest.raises(FileNotFoundError):
+        catalog.record(
+            "ab12", "OR-1234567", "public", str(destination), source_hash="hash2",
+            publish=lambda: helpers.publish_file(str(tmp_path / "missing.jp2"), str(destination)),
+        )
+
+    assert catalog.get("ab12", "OR-1234567", "public")["source_hash"] == "hash1"
+    assert destination.read_bytes() == b"old output"
+    catalog.close()
@@ -0,0 +1,83 @@
+import pytest
+
+from app.profiles import get_auto_levels, get_kakadu_options, split_options
+
+PROFILE = [
+    "Clevels=5",
+    "Clayers=12",
+    "-rate",
+    "3,0.25",
+    "-no_weights",
+    "",
+    "# Small images",
+    "[longest_side<=3000]",
+    "Clevels=auto",
+    "Clayers=6",
+    "[longest_side>10000]",
+    "Clevels=auto",
+    "-rate",
+    "2,0.25",
+]
+
+
+def test_split_options_keeps_flag_values_together():
+    assert split_options(["-rate", "3,0.25", "-no_weights", "-precise", "Clevels=5"]) == [
+        ["-rate", "3,0.25"],
+        ["-no_weights"],
+        ["-precise"],
+        ["Clevels=5"],
+    ]
+
+
+def test_get_kakadu_options_without_dimensions_uses_base_options():
+    assert get_kakadu_options(PROFILE) == [
+        "Clevels=5", "Clayers=12", "-rate", "3,0.25", "-no_weights",
+    ]
+
+
+def test_get_kakadu_options_applies_matching_rules():
+    assert get_kakadu_options(PROFILE, (1000, 750)) == [
+        "Clevels=2", "Clayers=6", "-rate", "3,0.25", "-no_weights",
+    ]
+    assert get_kakadu_options(PROFILE, (5000, 3750)) == get_kakadu_options(PROFILE)
+    assert get_kakadu_options(PROFILE, (9000, 20000)) == [
+        "Clevels=7", "Clayers=12", "-rate", "2,0.25", "-no_weights",
+    ]
+
+
+def test_get_auto_levels():
+    assert get_auto_levels(200, 100) == 1
+    assert get_auto_levels(1000, 750) == 2
+    assert get_auto_levels(4096, 4096) == 4
+
+
+def test_invalid_rule():
+    with pytest.raises(ValueError):
+        get_kakadu_options(["Clevels=5", "[longest_side=3000]"])
+
+
+@pytest.mark.parametrize("profile", ["default", "image"])
+def test_shipped_profiles_apply_large_rule_to_resized_maps(profile):
+    with open(f"profiles/{profile}.profile") as f:
+        lines = [line.strip() for line in f.readlines()]
+    # A 20000x15000 map is resized to 10000x7500 by get_resize_params
+    assert get_kakadu_options(lines, (10000, 7500))[0] == "Clevels=6"
+
+
+def test_get_kakadu_options_keeps_repeated_base_options():
+    lines = ["-rate", "3,0.25", "Cprecincts={256,256}", "-rate", "2,0.5", "[width>100]", "Clayers=6"]
+    assert get_kakadu_options(lines) == ["-rate", "3,0.25", "Cprecincts={256,256}", "-rate", "2,0.5"]
+    assert get_kakadu_options(lines, (200, 100)) == [
+        "-rate", "3,0.25", "Cprecincts={256,256}", "-rate", "2,0.5", "Clayers=6",
+    ]
+
+
+def test_rule_replaces_repeated_base_option_once():
+    lines = ["-rate", "3,0.25", "-rate", "2,0.5", "Clevels=5", "[width>100]", "-rate", "1"]
+    assert get_kakadu_options(lines, (200, 100)) == ["-rate", "1", "Clevels=5"]
+
+
+def test_rule_overrides_rate_without_top_layer_limit():
+    lines = ["Clevels=5", "-rate", "-,1,0.5", "-no_weights", "[width>100]", "-rate", "2,0.25"]
+    assert split_options(lines[:4]) == [["Clevels=5"], ["-rate", "-,1,0.5"], ["-no_weights"]]
+    assert get_kakadu_options(lines, (200, 100)) == ["Clevels=5", "-rate", "2,0.25", "-no_weights"]
@@ -1,6 +1,7 @@
 # System imports
 import glob, os
 import argparse
+import sys
 from pathlib import Path
 
 # External imports
@@ -8,6 +9,7 @@ from viaa.observability import logging
 from viaa.configuration import ConfigParser
 
 # Internal imports
+from app.catalog import OutputCatalog
 from app.file_transformation import FileTransformer
 
 # from app.file_validation import FileValidator
@@ -20,6 +22,7 @@ from app.helpers import (
     get_icc,
     get_image_dimensions,
     move_file,
+    publish_file,
     remove_file,
     rename_file,
 )
@@ -49,11 +52,23 @@ if __name__ == "__main__":
     parser.add_argument(
         "--profile", type=str, default=None, help="Kakadu profile to be used", required=False
     )
+    parser.add_argument(
+        "--cp_id", type=str, default=None, help="OR-ID of the content partner", required=False
+    )
+    parser.add_argument(
+        "--visibility", type=str, default=None, help="Visibility of the output: public or restricted", required=False
+    )
+    parser.add_argument(
+        "--source_hash", type=str, default=None, help="sha256 hash of the input file", required=False
+    )
     args = parser.parse_args()
     file_path = args.file_path
     destination = args.destination
     max_size = args.max_size
     profile = args.profile
+    cp_id = args.cp_id
+    visibility = args.visibility
+    source_hash = args.source_hash
 
     # Copy file and rename it to external_id.
     # File has to be copied so metadata can be added again later.
@@ -91,19 +106,46 @@ if __name__ == "__main__":
     file_transformer.convert_to_srgb(file_path, icc)
 
     # Encode to jp2
-    encoded_file = file_transformer.encode_image(file_path, profile)
+    encoded_file = file_transformer.encode_image(file_path, profile, resize_params)
     logger.debug("Encoded file %s", encoded_file)
 
     # Add metadata to file
     copy_metadata(copied_file_path, encoded_file)
 
-    # Move file to destination
-    if destination is not None:
+    # Move file to destination and record it in the catalog in one transaction
+    published = True
+    if destination is not None and cp_id is not None and visibility is not None:
+        logger.debug("Moving encoded_file file %s to %s", encoded_file, destination)
+        catalog = OutputCatalog(configParser.app_cfg["catalog"]["path"])
+        try:
+            catalog.record(
+                Path(destination).stem,
+                cp_id,
+                visibility,
+                destination,
+                profile=profile,
+                width=resize_params[0],
+                height=resize_params[1],
+                size=Path(encoded_file).stat().st_size,
+                source_hash=source_hash,
+                publish=lambda: publish_file(encoded_file, destination),
+            )
+        except FileNotFoundError as e:
+            logger.error(e)
+            published = False
+            # The encoded file is not kept, the watcher keeps the zip to retry
+            remove_file(encoded_file)
+        finally:
+            catalog.close()
+    elif destination is not None:
         logger.debug("Moving encoded_file file %s to %s", encoded_file, destination)
         move_file(encoded_file, destination)
-    logger.debug("moved")
 
     # Cleanup
     remove_file(copied_file_path)
     for f in glob.glob(copied_file_path + '*'):
         os.remove(f)
+
+    # Let the watcher know the output was not published
+    if not published:
+        sys.exit(1)